@@ -1,53 +1,72 @@
 from pathlib import Path
 from dataclasses import dataclass
-from typing import Type, Optional, Any, List, Tuple
-import math
+from typing import Type, Optional, Any, Dict, Final, List, Tuple
 
 
-@dataclass
+@dataclass(frozen=True)
 class CompetitionParameters:
     """Class defining model parameters"""
 
+    # Declared manually since dataclass(slots=True) requires python 3.10.
+    __slots__ = ("reward_percentage", "competition_id")
+
     # Reward percentage
     reward_percentage: float
     # Competition id
     competition_id: str
 
+    # Frozen slotted classes need explicit state handling to support pickle and copy.
+    def __getstate__(self):
+        return (self.reward_percentage, self.competition_id)
+
+    def __setstate__(self, state):
+        object.__setattr__(self, "reward_percentage", state[0])
+        object.__setattr__(self, "competition_id", state[1])
+
 
 # ---------------------------------
 # Project Constants.
 # ---------------------------------
 
 # The validator WANDB project.
-WANDB_PROJECT = "myshell-tts-subnet"
+WANDB_PROJECT: Final[str] = "myshell-tts-subnet"
 # The uid for this subnet.
-SUBNET_UID = 3
+SUBNET_UID: Final[int] = 3
 # The start block of this subnet
-SUBNET_START_BLOCK = 2635801
+SUBNET_START_BLOCK: Final[int] = 2635801
 # The root directory of this project.
-ROOT_DIR = Path(__file__).parent.parent
+ROOT_DIR: Final[Path] = Path(__file__).resolve().parent.parent
 # The maximum bytes for the hugging face repo
-MAX_HUGGING_FACE_BYTES: int = 512 * 1024 * 1024
+MAX_HUGGING_FACE_BYTES: Final[int] = 1 << 29  # 512 MiB
 # Schedule of model architectures
-COMPETITION_SCHEDULE: List[CompetitionParameters] = [
+COMPETITION_SCHEDULE: Final[Tuple[CompetitionParameters, ...]] = (
     CompetitionParameters(
         reward_percentage=1.0,
         competition_id="p240",
     ),
-]
-ORIGINAL_COMPETITION_ID = "p240"
-CONSTANT_ALPHA = 0.2 # enhance vtrust
-timestamp_epsilon = 0.04 # enhance vtrust
+)
+# Competition parameters keyed by competition id for constant time lookups.
+COMPETITION_PARAMETERS_BY_ID: Final[Dict[str, CompetitionParameters]] = {
+    x.competition_id: x for x in COMPETITION_SCHEDULE
+}
+ORIGINAL_COMPETITION_ID: Final[str] = "p240"
+CONSTANT_ALPHA: Final[float] = 0.2 # enhance vtrust
+timestamp_epsilon: Final[float] = 0.04 # enhance vtrust
 
-assert math.isclose(sum(x.reward_percentage for x in COMPETITION_SCHEDULE), 1.0)
+# Skipped entirely when running with -O.
+if __debug__:
+    _total_reward_percentage = sum(x.reward_percentage for x in COMPETITION_SCHEDULE)
+    assert (
+        abs(_total_reward_percentage - 1.0) < 1e-9
+    ), f"Competition reward percentages must sum to 1.0, got {_total_reward_percentage}"
 
 # ---------------------------------
 # Miner/Validator Model parameters.
 # ---------------------------------
 
-weights_version_key = 4
+weights_version_key: Final[int] = 4
 
 # validator weight moving average term. alpha = 1-lr.
-lr = 0.2
+lr: Final[float] = 0.2
 # validator scoring exponential temperature
-temperature = 0.08
+temperature: Final[float] = 0.08
@@ -72,3 +72,15 @@ class ModelMetadata(BaseModel):
     block: PositiveInt = Field(
         description="Block on which this model was claimed on the chain."
     )
+
+    def matches(self, other: Optional["ModelMetadata"]) -> bool:
+        """Returns whether other refers to the same model commitment.
+
+        Cheaper than full equality since the content hash and block identify the commitment.
+        """
+        return (
+            other is not None
+            and self.id.hash == other.id.hash
+            and self.block == other.block
+            and self.id.competition_id == other.id.competition_id
+        )
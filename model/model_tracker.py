@@ -22,6 +22,10 @@ class ModelTracker:
         self.miner_hotkey_to_last_touched_dict: dict[str, datetime.datetime] = dict()
         # Create a dict from miner hotkey to whether the model has been downloaded locally or not.
         self.model_downloaded: set[str] = set()
+        # Create a dict from miner hotkey to a counter bumped whenever its model metadata changes.
+        self.miner_hotkey_to_metadata_version: dict[str, int] = dict()
+        # Create a dict from miner hotkey to an event set once its in flight download finishes.
+        self.download_inflight: dict[str, threading.Event] = dict()
 
         # List of overwritten models that may be safe to delete if not curently in use.
         self.old_model_metadata: list[tuple[str, ModelMetadata]] = []
@@ -92,6 +96,12 @@ class ModelTracker:
 
             self.model_metadata_in_use.remove(pair)
 
+    def get_metadata_version_for_miner_hotkey(self, hotkey: str) -> int:
+        """Returns a counter that changes whenever the model metadata for a given hotkey is updated."""
+
+        with self.lock:
+            return self.miner_hotkey_to_metadata_version.get(hotkey, 0)
+
     def get_miner_hotkey_to_last_touched_dict(self) -> Dict[str, datetime.datetime]:
         """Returns the mapping from miner hotkey to last time it was touched."""
 
@@ -137,6 +147,9 @@ class ModelTracker:
 
             self.miner_hotkey_to_model_metadata_dict[hotkey] = model_metadata
             self.miner_hotkey_to_last_touched_dict[hotkey] = datetime.datetime.now()
+            self.miner_hotkey_to_metadata_version[hotkey] = (
+                self.miner_hotkey_to_metadata_version.get(hotkey, 0) + 1
+            )
             self.model_downloaded.discard(hotkey)
 
             bt.logging.trace(f"Updated Miner {hotkey}. ModelMetadata={model_metadata}.")
@@ -159,6 +172,9 @@ class ModelTracker:
 
             self.miner_hotkey_to_model_metadata_dict[hotkey] = model_metadata
             self.miner_hotkey_to_last_touched_dict[hotkey] = datetime.datetime.now()
+            self.miner_hotkey_to_metadata_version[hotkey] = (
+                self.miner_hotkey_to_metadata_version.get(hotkey, 0) + 1
+            )
             self.model_downloaded.add(hotkey)
 
             bt.logging.trace(f"Updated Miner {hotkey}. ModelMetadata={model_metadata}.")
@@ -1,7 +1,10 @@
 import bittensor as bt
 import asyncio
-from typing import Optional
-from constants import CompetitionParameters, COMPETITION_SCHEDULE
+import concurrent.futures
+import threading
+import weakref
+from typing import AsyncIterator, Callable, Iterable, Optional, Tuple, TypeVar, Union
+from constants import CompetitionParameters, COMPETITION_PARAMETERS_BY_ID
 import constants
 from model.data import ModelMetadata, Model
 from model.model_tracker import ModelTracker
@@ -9,6 +12,9 @@ from model.storage.local_model_store import LocalModelStore
 from model.storage.model_metadata_store import ModelMetadataStore
 from model.storage.remote_model_store import RemoteModelStore
 from model.utils import get_hash_of_two_strings
+from utilities import utils
+
+T = TypeVar("T")
 
 
 class ModelUpdater:
@@ -20,142 +26,399 @@ class ModelUpdater:
         remote_store: RemoteModelStore,
         local_store: LocalModelStore,
         model_tracker: ModelTracker,
+        max_concurrent_downloads: int = 4,
     ):
         self.metadata_store = metadata_store
         self.remote_store = remote_store
         self.local_store = local_store
         self.model_tracker = model_tracker
         self.min_block: Optional[int] = None
+        # Caps the number of in flight downloads per event loop. Metadata checks are not limited.
+        self.max_concurrent_downloads = max_concurrent_downloads
+        # One semaphore per event loop since asyncio primitives cannot be shared across loops.
+        self._download_sems = weakref.WeakKeyDictionary()
+        self._download_sems_lock = threading.Lock()
+        # Background thread and its long lived event loop used to download models ahead of evaluation.
+        self._prefetch_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._prefetch_thread: Optional[threading.Thread] = None
+        self._prefetch_future: Optional[concurrent.futures.Future] = None
 
     def set_min_block(self, val: Optional[int]):
         self.min_block = val
 
-    @classmethod
-    def get_competition_parameters(cls, id: str) -> Optional[CompetitionParameters]:
-        for x in COMPETITION_SCHEDULE:
-            if x.competition_id == id:
-                return x
-        return None
+    def _get_download_semaphore(self) -> asyncio.Semaphore:
+        """Returns the download semaphore for the running event loop.
 
-    async def _get_metadata(self, hotkey: str) -> Optional[ModelMetadata]:
-        """Get metadata about a model by hotkey"""
-        return await self.metadata_store.retrieve_model_metadata(hotkey)
+        The validator drives this class with asyncio.run from several threads, so the cap of
+        max_concurrent_downloads applies per event loop (i.e. per asyncio.run call), not globally.
+        """
+        loop = asyncio.get_running_loop()
+        with self._download_sems_lock:
+            semaphore = self._download_sems.get(loop)
+            if semaphore is None:
+                semaphore = asyncio.Semaphore(self.max_concurrent_downloads)
+                self._download_sems[loop] = semaphore
+            return semaphore
 
-    async def sync_models(self, hotkeys: list[str]):
-        tasks = [self.sync_model(hotkey) for hotkey in hotkeys]
-        return await asyncio.gather(*tasks, return_exceptions=True)
+    @classmethod
+    def get_competition_parameters(cls, id: str) -> Optional[CompetitionParameters]:
+        return COMPETITION_PARAMETERS_BY_ID.get(id)
 
-    async def sync_model_metadata_only(self, hotkey: str) -> bool:
-        """Updates the metadata only for a hotkey if out of sync and returns if it was updated."""
-        metadata = await self._get_metadata(hotkey)
+    def _validate_and_normalize(
+        self, hotkey: str, metadata: Optional[ModelMetadata]
+    ) -> Optional[Tuple[ModelMetadata, CompetitionParameters]]:
+        """Returns the normalized metadata and its competition parameters, or None if the model should be skipped.
 
+        The passed in metadata is never mutated.
+        """
         if not metadata:
-            bt.logging.trace(
-                f"No valid metadata found on the chain for hotkey {hotkey}"
-            )
-            return False
+            if utils.is_trace_enabled():
+                bt.logging.trace(
+                    f"No valid metadata found on the chain for hotkey {hotkey}"
+                )
+            return None
 
         if self.min_block and metadata.block < self.min_block:
-            bt.logging.trace(
-                f"Skipping model for {hotkey} since it was submitted at block {metadata.block} which is less than the minimum block {self.min_block}"
-            )
-            return False
+            if utils.is_trace_enabled():
+                bt.logging.trace(
+                    f"Skipping model for {hotkey} since it was submitted at block {metadata.block} which is less than the minimum block {self.min_block}"
+                )
+            return None
 
         # Backwards compatability for models submitted before competition id added
         if metadata.id.competition_id is None:
-            metadata.id.competition_id = constants.ORIGINAL_COMPETITION_ID
+            metadata = metadata.copy(
+                update={
+                    "id": metadata.id.copy(
+                        update={"competition_id": constants.ORIGINAL_COMPETITION_ID}
+                    )
+                }
+            )
 
         parameters = ModelUpdater.get_competition_parameters(metadata.id.competition_id)
         if not parameters:
-            bt.logging.trace(
-                f"No competition parameters found for {metadata.id.competition_id}"
+            if utils.is_trace_enabled():
+                bt.logging.trace(
+                    f"No competition parameters found for {metadata.id.competition_id}"
+                )
+            return None
+
+        return metadata, parameters
+
+    async def _get_metadata(self, hotkey: str) -> Optional[ModelMetadata]:
+        """Get metadata about a model by hotkey"""
+        return await self.metadata_store.retrieve_model_metadata(hotkey)
+
+    async def sync_models(
+        self, hotkeys: Iterable[str]
+    ) -> AsyncIterator[tuple[str, Union[bool, Exception]]]:
+        """Syncs the models for the hotkeys, yielding (hotkey, result or exception) as each one finishes."""
+        hotkeys = tuple(hotkeys)
+        # Fetch the metadata for all hotkeys up front to avoid a chain round trip per hotkey.
+        try:
+            metadata_by_hotkey = await self.metadata_store.batch_get_metadata(hotkeys)
+        except Exception as e:
+            # Keep the per hotkey result contract if the batch fetch itself fails.
+            for hotkey in hotkeys:
+                yield hotkey, e
+            return
+
+        async def _sync(hotkey: str) -> tuple[str, Union[bool, Exception]]:
+            try:
+                return hotkey, await self._sync_model_with_meta(
+                    hotkey, metadata_by_hotkey.get(hotkey)
+                )
+            except Exception as e:
+                return hotkey, e
+
+        tasks = [asyncio.ensure_future(_sync(hotkey)) for hotkey in hotkeys]
+        try:
+            for task in asyncio.as_completed(tasks):
+                yield await task
+        finally:
+            # Do not leave syncs running if the caller stops iterating early.
+            for task in tasks:
+                task.cancel()
+
+    async def sync_models_all(
+        self, hotkeys: Iterable[str]
+    ) -> list[Union[bool, Exception]]:
+        """Syncs the models for the hotkeys and returns the results in the same order as the hotkeys."""
+        hotkeys = tuple(hotkeys)
+        results = {}
+        async for hotkey, result in self.sync_models(hotkeys):
+            results[hotkey] = result
+        return [results[hotkey] for hotkey in hotkeys]
+
+    async def sync_models_metadata_only(self, hotkeys: Iterable[str]):
+        hotkeys = tuple(hotkeys)
+        # Fetch the metadata for all hotkeys up front to avoid a chain round trip per hotkey.
+        metadata_by_hotkey = await self.metadata_store.batch_get_metadata(hotkeys)
+        tasks = [
+            self._sync_model_metadata_only_with_meta(
+                hotkey, metadata_by_hotkey.get(hotkey)
             )
+            for hotkey in hotkeys
+        ]
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def sync_model_metadata_only(self, hotkey: str) -> bool:
+        """Updates the metadata only for a hotkey if out of sync and returns if it was updated."""
+        metadata = await self._get_metadata(hotkey)
+        return await self._sync_model_metadata_only_with_meta(hotkey, metadata)
+
+    async def _sync_model_metadata_only_with_meta(
+        self, hotkey: str, metadata: Optional[ModelMetadata]
+    ) -> bool:
+        """Updates the metadata only for a hotkey from already fetched chain metadata."""
+        validated = self._validate_and_normalize(hotkey, metadata)
+        if not validated:
             return False
+        metadata, parameters = validated
 
         self.model_tracker.on_miner_model_updated_metadata_only(hotkey, metadata)
         return True
 
     async def ensure_model_downloaded(self, hotkey: str):
-        with self.model_tracker.lock:
+        def read_snapshot() -> Optional[Tuple[ModelMetadata, CompetitionParameters, int]]:
             if hotkey in self.model_tracker.model_downloaded:
-                return
-
+                return None
             metadata = self.model_tracker.miner_hotkey_to_model_metadata_dict[hotkey]
             parameters = ModelUpdater.get_competition_parameters(metadata.id.competition_id)
+            version = self.model_tracker.get_metadata_version_for_miner_hotkey(hotkey)
+            return metadata, parameters, version
 
+        while True:
+            # Section A: snapshot what to download. The lock is not held during the download.
+            claim = await self._claim_download(hotkey, read_snapshot)
+            if claim is None:
+                return
+            event, (metadata, parameters, version) = claim
+
+            try:
+                await self._download_and_verify(hotkey, metadata, parameters)
+
+                # Section B: mark it downloaded, unless the metadata changed while downloading.
+                with self.model_tracker.lock:
+                    if (
+                        self.model_tracker.get_metadata_version_for_miner_hotkey(hotkey)
+                        == version
+                    ):
+                        self.model_tracker.model_downloaded.add(hotkey)
+                        return
+            finally:
+                self._release_download(hotkey, event)
+
+            # The metadata was updated during the download so retry with the new metadata.
+
+    async def _claim_download(
+        self, hotkey: str, read_snapshot: Callable[[], Optional[T]]
+    ) -> Optional[Tuple[threading.Event, T]]:
+        """Waits until no other download is in flight for the hotkey, then claims it.
+
+        read_snapshot is called under the tracker lock right before claiming and its result is returned
+        with the claim. If it returns None there is nothing to download and nothing is claimed. If it
+        raises nothing is claimed either, so a failed lookup can never leak the claim.
+        """
+        while True:
+            with self.model_tracker.lock:
+                event = self.model_tracker.download_inflight.get(hotkey)
+                if event is None:
+                    snapshot = read_snapshot()
+                    if snapshot is None:
+                        return None
+                    event = threading.Event()
+                    self.model_tracker.download_inflight[hotkey] = event
+                    return event, snapshot
+
+            # Another caller is already downloading this model. Wait for it and check again.
+            await asyncio.to_thread(event.wait)
+
+    def _release_download(self, hotkey: str, event: threading.Event):
+        """Releases a claim from _claim_download and wakes any waiters.
+
+        If the download failed the waiters will retry it themselves.
+        """
+        with self.model_tracker.lock:
+            if self.model_tracker.download_inflight.get(hotkey) is event:
+                del self.model_tracker.download_inflight[hotkey]
+        event.set()
+
+    async def _download_and_verify(
+        self,
+        hotkey: str,
+        metadata: ModelMetadata,
+        parameters: CompetitionParameters,
+    ):
+        """Makes the model for the metadata available locally, raising if its hash does not match."""
+        # Reuse the model if it is already on disk, e.g. after a restart. Hashing it reads the
+        # whole checkpoint so do it off the event loop.
+        model = await asyncio.to_thread(self.local_store.try_load, hotkey, metadata.id)
+        if model is None or not ModelUpdater._hash_matches(hotkey, model, metadata):
             # Get the local path based on the local store to download to (top level hotkey path)
             path = self.local_store.get_path(hotkey)
             # Otherwise we need to download the new model based on the metadata.
-            model = await self.remote_store.download_model(metadata.id, path, parameters)
+            async with self._get_download_semaphore():
+                model = await self.remote_store.download_model(
+                    metadata.id, path, parameters
+                )
 
-            # Check that the hash of the downloaded content matches.
-            if model.id.hash != metadata.id.hash:
-                # If the hash does not match directly, also try it with the hotkey of the miner.
-                # This is allowed to help miners prevent same-block copiers.
-                hash_with_hotkey = get_hash_of_two_strings(model.id.hash, hotkey)
-                if hash_with_hotkey != metadata.id.hash:
-                    bt.logging.trace(
-                        f"Sync for hotkey {hotkey} failed. Hash of content downloaded from hugging face {model.id.hash} "
-                        + f"or the hash including the hotkey {hash_with_hotkey} do not match chain metadata {metadata}."
-                    )
-                    raise ValueError(
-                        f"Sync for hotkey {hotkey} failed. Hash of content downloaded from hugging face does not match chain metadata. {metadata}"
-                    )
+        # Check that the hash of the downloaded content matches.
+        if not ModelUpdater._hash_matches(hotkey, model, metadata):
+            if utils.is_trace_enabled():
+                bt.logging.trace(
+                    f"Sync for hotkey {hotkey} failed. Hash of content downloaded from hugging face {model.id.hash} "
+                    + f"or the hash including the hotkey do not match chain metadata {metadata}."
+                )
+            raise ValueError(
+                f"Sync for hotkey {hotkey} failed. Hash of content downloaded from hugging face does not match chain metadata. {metadata}"
+            )
 
-            self.model_tracker.model_downloaded.add(hotkey)
+    @staticmethod
+    def _hash_matches(hotkey: str, model: Model, metadata: ModelMetadata) -> bool:
+        """Returns whether the content hash of the model matches the hash committed to the chain."""
+        # If the hash does not match directly, also try it with the hotkey of the miner.
+        # This is allowed to help miners prevent same-block copiers.
+        return (
+            model.id.hash == metadata.id.hash
+            or get_hash_of_two_strings(model.id.hash, hotkey) == metadata.id.hash
+        )
 
     async def sync_model(self, hotkey: str) -> bool:
         """Updates local model for a hotkey if out of sync and returns if it was updated."""
         # Get the metadata for the miner.
         metadata = await self._get_metadata(hotkey)
+        return await self._sync_model_with_meta(hotkey, metadata)
 
-        if not metadata:
-            bt.logging.trace(
-                f"No valid metadata found on the chain for hotkey {hotkey}"
-            )
-            return False
-
-        if self.min_block and metadata.block < self.min_block:
-            bt.logging.trace(
-                f"Skipping model for {hotkey} since it was submitted at block {metadata.block} which is less than the minimum block {self.min_block}"
-            )
-            return False
-
-        # Backwards compatability for models submitted before competition id added
-        if metadata.id.competition_id is None:
-            metadata.id.competition_id = constants.ORIGINAL_COMPETITION_ID
-
-        parameters = ModelUpdater.get_competition_parameters(metadata.id.competition_id)
-        if not parameters:
-            bt.logging.trace(
-                f"No competition parameters found for {metadata.id.competition_id}"
-            )
+    async def _sync_model_with_meta(
+        self, hotkey: str, metadata: Optional[ModelMetadata]
+    ) -> bool:
+        """Updates local model for a hotkey from already fetched chain metadata."""
+        validated = self._validate_and_normalize(hotkey, metadata)
+        if not validated:
             return False
+        metadata, parameters = validated
 
         # Check what model id the model tracker currently has for this hotkey.
         tracker_model_metadata = self.model_tracker.get_model_metadata_for_miner_hotkey(
             hotkey
         )
-        if metadata == tracker_model_metadata:
+        if metadata.matches(tracker_model_metadata):
             return False
 
-        # Get the local path based on the local store to download to (top level hotkey path)
-        path = self.local_store.get_path(hotkey)
+        def read_snapshot() -> Optional[bool]:
+            # Another download may have synced this model while we were waiting.
+            if (
+                metadata.matches(
+                    self.model_tracker.get_model_metadata_for_miner_hotkey(hotkey)
+                )
+                and hotkey in self.model_tracker.model_downloaded
+            ):
+                return None
+            return True
 
-        # Otherwise we need to download the new model based on the metadata.
-        model = await self.remote_store.download_model(metadata.id, path, parameters)
+        # Share the in flight gate with ensure_model_downloaded so the update and evaluation
+        # threads never download into the same hotkey directory at once.
+        claim = await self._claim_download(hotkey, read_snapshot)
+        if claim is None:
+            return False
+        event, _ = claim
+        try:
+            # Get the local path based on the local store to download to (top level hotkey path)
+            path = self.local_store.get_path(hotkey)
 
-        # Check that the hash of the downloaded content matches.
-        hash_matches_directly = model.id.hash == metadata.id.hash
-        hash_with_hotkey = get_hash_of_two_strings(model.id.hash, hotkey)
-        hash_matches_with_hotkey = hash_with_hotkey == metadata.id.hash
+            # Otherwise we need to download the new model based on the metadata.
+            async with self._get_download_semaphore():
+                model = await self.remote_store.download_model(
+                    metadata.id, path, parameters
+                )
 
-        if not (hash_matches_directly or hash_matches_with_hotkey):
-            raise ValueError(
-                f"Sync for hotkey {hotkey} failed. Hash of content downloaded from hugging face does not match chain metadata. {metadata}"
-            )
+            # Check that the hash of the downloaded content matches.
+            if not ModelUpdater._hash_matches(hotkey, model, metadata):
+                raise ValueError(
+                    f"Sync for hotkey {hotkey} failed. Hash of content downloaded from hugging face does not match chain metadata. {metadata}"
+                )
 
-        # Update the tracker
-        self.model_tracker.on_miner_model_updated(hotkey, metadata)
+            # Update the tracker
+            self.model_tracker.on_miner_model_updated(hotkey, metadata)
+        finally:
+            self._release_download(hotkey, event)
 
         return True
+
+    def start_prefetcher(self):
+        """Starts a background thread that runs the downloads requested through prefetch.
+
+        The thread owns a long lived event loop, unlike the short asyncio.run calls used elsewhere,
+        so prefetches keep running in between validator steps.
+        """
+        if self._prefetch_loop is not None:
+            return
+
+        self._prefetch_loop = asyncio.new_event_loop()
+        self._prefetch_thread = threading.Thread(
+            target=self._prefetch_loop.run_forever, daemon=True
+        )
+        self._prefetch_thread.start()
+
+    def stop_prefetcher(self):
+        """Cancels any prefetch in progress and stops the background thread."""
+        if self._prefetch_loop is None:
+            return
+
+        asyncio.run_coroutine_threadsafe(
+            self._cancel_prefetch_tasks(), self._prefetch_loop
+        ).result()
+        self._prefetch_loop.call_soon_threadsafe(self._prefetch_loop.stop)
+        self._prefetch_thread.join()
+        self._prefetch_loop.close()
+
+        self._prefetch_loop = None
+        self._prefetch_thread = None
+        self._prefetch_future = None
+
+    def prefetch(self, hotkeys: Iterable[str]) -> Optional[concurrent.futures.Future]:
+        """Downloads the models for the hotkeys in the background so they are local before they are evaluated.
+
+        Replaces any prefetch still in progress. Does nothing if the prefetcher is not started.
+        """
+        if self._prefetch_loop is None:
+            return None
+
+        if self._prefetch_future is not None:
+            self._prefetch_future.cancel()
+        self._prefetch_future = asyncio.run_coroutine_threadsafe(
+            self._prefetch_models(tuple(hotkeys)), self._prefetch_loop
+        )
+        return self._prefetch_future
+
+    async def _cancel_prefetch_tasks(self):
+        tasks = [
+            task for task in asyncio.all_tasks() if task is not asyncio.current_task()
+        ]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _prefetch_models(self, hotkeys: Tuple[str, ...]):
+        """Downloads the models for the hotkeys, skipping any that are already downloaded and unchanged."""
+        try:
+            # Fetch the metadata for all hotkeys up front to avoid a chain round trip per hotkey.
+            metadata_by_hotkey = await self.metadata_store.batch_get_metadata(hotkeys)
+        except Exception as e:
+            bt.logging.warning(f"Failed to fetch metadata to prefetch models: {e}")
+            return
+
+        async def _prefetch(hotkey: str):
+            try:
+                # Pick up a newer model from the chain. The tracker is only updated once it is downloaded.
+                await self._sync_model_with_meta(hotkey, metadata_by_hotkey.get(hotkey))
+
+                # Download the tracked model if only its metadata is known, e.g. after a metadata only sync.
+                if self.model_tracker.get_model_metadata_for_miner_hotkey(hotkey):
+                    await self.ensure_model_downloaded(hotkey)
+            except Exception as e:
+                if utils.is_trace_enabled():
+                    bt.logging.trace(f"Prefetch for hotkey {hotkey} failed: {e}")
+
+        await asyncio.gather(*[_prefetch(hotkey) for hotkey in hotkeys])
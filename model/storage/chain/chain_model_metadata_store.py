@@ -5,11 +5,35 @@ import os
 from model.data import ModelId, ModelMetadata
 import constants
 from model.storage.model_metadata_store import ModelMetadataStore
-from typing import Optional
+from typing import Any, Dict, Iterable, Optional, Sequence
 
 from utilities import utils
 
 
+def _get_commitments(
+    subtensor: bt.subtensor, subnet_uid: int, hotkeys: Sequence[str]
+) -> Dict[str, Any]:
+    """Returns the raw commitments for the given hotkeys using a single multi key query."""
+    with subtensor.substrate as substrate:
+        storage_keys = [
+            substrate.create_storage_key(
+                "Commitments", "CommitmentOf", [subnet_uid, hotkey]
+            )
+            for hotkey in hotkeys
+        ]
+        hotkey_by_storage_key = {
+            storage_key.to_hex(): hotkey
+            for storage_key, hotkey in zip(storage_keys, hotkeys)
+        }
+        result = substrate.query_multi(storage_keys)
+        # Results are not guaranteed to be in key order so match them back by storage key.
+        # Convert to plain values so the result can be passed back from the subprocess.
+        return {
+            hotkey_by_storage_key[storage_key.to_hex()]: value.value
+            for storage_key, value in result
+        }
+
+
 class ChainModelMetadataStore(ModelMetadataStore):
     """Chain based implementation for storing and retrieving metadata about a model."""
 
@@ -49,6 +73,40 @@ class ChainModelMetadataStore(ModelMetadataStore):
 
         metadata = utils.run_in_subprocess(partial, 20)
 
+        return self._parse_model_metadata(hotkey, metadata)
+
+    async def batch_get_metadata(
+        self, hotkeys: Iterable[str]
+    ) -> Dict[str, Optional[ModelMetadata]]:
+        """Retrieves model metadata on this subnet for many hotkeys with a single chain round trip."""
+        hotkeys = tuple(hotkeys)
+        if not hotkeys:
+            return {}
+
+        # Wrap calls to the subtensor in a subprocess with a timeout to handle potential hangs.
+        partial = functools.partial(
+            _get_commitments, self.subtensor, self.subnet_uid, hotkeys
+        )
+
+        commitments = utils.run_in_subprocess(partial, 60)
+
+        metadata_by_hotkey = {}
+        for hotkey in hotkeys:
+            try:
+                metadata_by_hotkey[hotkey] = self._parse_model_metadata(
+                    hotkey, commitments.get(hotkey)
+                )
+            except Exception:
+                # A malformed commitment should only affect its own hotkey.
+                bt.logging.trace(
+                    f"Failed to parse the metadata on the chain for hotkey {hotkey}."
+                )
+                metadata_by_hotkey[hotkey] = None
+        return metadata_by_hotkey
+
+    @staticmethod
+    def _parse_model_metadata(hotkey: str, metadata: Any) -> Optional[ModelMetadata]:
+        """Parses the raw commitment for a hotkey into model metadata, if valid."""
         if not metadata:
             return None
 
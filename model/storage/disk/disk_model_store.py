@@ -1,7 +1,7 @@
 import bittensor as bt
 import datetime
 import os
-from typing import Dict
+from typing import Dict, Optional
 from constants import CompetitionParameters
 from model.data import Model, ModelId
 from model.storage.disk import utils
@@ -38,6 +38,18 @@ class DiskModelStore(LocalModelStore):
 
         return Model(id=model_id, ckpt=ckpt)
 
+    def try_load(self, hotkey: str, model_id: ModelId) -> Optional[Model]:
+        """Returns the model if it is already on disk, with the hash computed from its content."""
+        if not model_id.commit:
+            return None
+
+        model_dir = utils.get_local_model_snapshot_dir(self.base_dir, hotkey, model_id)
+        if not os.path.isfile(os.path.join(model_dir, "checkpoint.safetensors")):
+            return None
+
+        model_hash = utils.get_hash_of_directory(model_dir)
+        return Model(id=model_id.copy(update={"hash": model_hash}), ckpt=model_dir)
+
     def delete_unreferenced_models(
         self,
         valid_models_by_hotkey: Dict[str, ModelId],
@@ -89,6 +101,17 @@ class DiskModelStore(LocalModelStore):
                     # Check all the commit paths.
                     for snapshot_path in snapshot_subfolder_paths:
                         snapshot_dir = Path(snapshot_path)
+
+                        # Remove partial downloads left behind if a download was interrupted.
+                        for incomplete_path in snapshot_dir.glob("*.incomplete"):
+                            deleted_file = utils.remove_file_out_of_grace(
+                                str(incomplete_path), grace_period_seconds
+                            )
+                            if deleted_file:
+                                bt.logging.trace(
+                                    f"Removed incomplete download at: {incomplete_path}."
+                                )
+
                         commit_subfolder_paths = [
                             str(d) for d in snapshot_dir.iterdir() if d.is_dir()
                         ]
@@ -4,6 +4,7 @@ import hashlib
 import os
 import shutil
 import sys
+from typing import Dict, Optional
 from model.data import ModelId
 
 
@@ -76,21 +77,19 @@ def remove_dir_out_of_grace(path: str, grace_period_seconds: int) -> bool:
     return remove_dir_out_of_grace_by_datetime(path, grace_period_seconds, last_modified)
 
 
-def realize_symlinks_in_directory(path: str) -> int:
-    """Realizes all symlinks in the given directory, moving the linked file to the location. Returns count removed."""
-    realized_symlinks = 0
+def remove_file_out_of_grace(path: str, grace_period_seconds: int) -> bool:
+    """Removes a file if the last modified time is out of grace period secs. Returns if it was deleted."""
+    grace = datetime.timedelta(seconds=grace_period_seconds)
 
-    for cur_path, dirnames, filenames in os.walk(path):
-        for filename in filenames:
-            path = os.path.abspath(os.path.join(cur_path, filename))
-            # Get path resolving symlinks if encountered
-            real_path = os.path.realpath(path)
-            # If different then move
-            if path != real_path:
-                realized_symlinks += 1
-                shutil.move(real_path, path)
+    try:
+        last_modified = datetime.datetime.fromtimestamp(os.stat(path).st_mtime)
+        if last_modified < datetime.datetime.now() - grace:
+            os.remove(path)
+            return True
+    except FileNotFoundError:
+        pass
 
-    return realized_symlinks
+    return False
 
 
 def get_hash_of_file(path: str) -> str:
@@ -105,7 +104,14 @@ def get_hash_of_file(path: str) -> str:
     return base64.b64encode(file_hash.digest()).decode("utf-8")
 
 
-def get_hash_of_directory(path: str) -> str:
+def get_hash_of_directory(path: str, file_hashes: Optional[Dict[str, str]] = None) -> str:
+    """Hashes all files under a directory.
+
+    Args:
+        path (str): The directory to hash.
+        file_hashes (Optional[Dict[str, str]]): Already computed hashes, by file path, to use instead of re-reading those files.
+    """
+    file_hashes = file_hashes or {}
     dir_hash = hashlib.sha256()
 
     # Recursively walk everything under the directory for files.
@@ -115,7 +121,7 @@ def get_hash_of_directory(path: str) -> str:
         # Ensure we walk files in a consistent order.
         for filename in sorted(filenames):
             path = os.path.join(cur_path, filename)
-            file_hash = get_hash_of_file(path)
+            file_hash = file_hashes.get(path) or get_hash_of_file(path)
             dir_hash.update(file_hash.encode())
 
     return base64.b64encode(dir_hash.digest()).decode("utf-8")
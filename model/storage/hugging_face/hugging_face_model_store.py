@@ -1,10 +1,15 @@
+import asyncio
 import tempfile
 import os
-from huggingface_hub import HfApi
+import base64
+import hashlib
+from huggingface_hub import HfApi, hf_hub_url
+from huggingface_hub.utils import build_hf_headers, get_session, hf_raise_for_status
 from model.data import Model, ModelId
 from model.storage.disk import utils
 from transformers import AutoModelForCausalLM, AutoTokenizer
 from constants import CompetitionParameters, MAX_HUGGING_FACE_BYTES
+from typing import Optional
 
 from model.storage.remote_model_store import RemoteModelStore
 import constants
@@ -84,6 +89,43 @@ class HuggingFaceModelStore(RemoteModelStore):
             # Return a ModelId with both the correct commit and hash.
             return model_with_hash.id
 
+    def _download_file(self, url: str, path: str, token: Optional[str]) -> str:
+        """Downloads url to path and returns the hash of the content, computed while streaming."""
+        file_hash = hashlib.sha256()
+        size = 0
+
+        # Write to a unique temporary file first so a partial download is never mistaken for a
+        # complete one, and concurrent downloads of the same model do not clobber each other.
+        # It lives one level up so it is never included when hashing the model directory.
+        # Any left behind by a killed process are removed by delete_unreferenced_models.
+        tmp_dir = os.path.dirname(os.path.dirname(path))
+        os.makedirs(tmp_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=tmp_dir, suffix=".incomplete")
+        os.close(fd)
+        try:
+            # Reuse the pooled per thread session from huggingface_hub instead of a new connection each time.
+            with get_session().get(
+                url, headers=build_hf_headers(token=token), stream=True, timeout=60
+            ) as response:
+                hf_raise_for_status(response)
+                with open(tmp_path, "wb") as f:
+                    for chunk in response.iter_content(chunk_size=1024 * 1024):
+                        size += len(chunk)
+                        if size > MAX_HUGGING_FACE_BYTES:
+                            raise ValueError(
+                                f"Hugging Face file over maximum size limit. Limit {MAX_HUGGING_FACE_BYTES}."
+                            )
+                        f.write(chunk)
+                        file_hash.update(chunk)
+            # Only create the model directory once the download succeeded so a failed one does not leave it empty.
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+        return base64.b64encode(file_hash.digest()).decode("utf-8")
+
     async def download_model(
         self,
         model_id: ModelId,
@@ -102,8 +144,13 @@ class HuggingFaceModelStore(RemoteModelStore):
         except:
             token = None
         api = HfApi(token=token)
-        model_info = api.model_info(
-            repo_id=repo_id, revision=model_id.commit, timeout=10, files_metadata=True
+        # The Hugging Face calls block so run them off the event loop to let downloads overlap.
+        model_info = await asyncio.to_thread(
+            api.model_info,
+            repo_id=repo_id,
+            revision=model_id.commit,
+            timeout=10,
+            files_metadata=True,
         )
         size = sum(repo_file.size for repo_file in model_info.siblings)
         if size > MAX_HUGGING_FACE_BYTES:
@@ -111,21 +158,22 @@ class HuggingFaceModelStore(RemoteModelStore):
                 f"Hugging Face repo over maximum size limit. Size {size}. Limit {MAX_HUGGING_FACE_BYTES}."
             )
 
-        api.hf_hub_download(
-            repo_id=repo_id,
-            revision=model_id.commit,
-            filename="checkpoint.safetensors",
-            cache_dir=local_path,
-        )
-
-        # Get the directory the model was stored to.
+        # Get the directory the model will be stored to.
         model_dir = utils.get_hf_download_path(local_path, model_id)
-
-        # Realize all symlinks in that directory since Transformers library does not support avoiding symlinks.
-        utils.realize_symlinks_in_directory(model_dir)
+        ckpt_path = os.path.join(model_dir, "checkpoint.safetensors")
+
+        # Stream the checkpoint to disk, hashing it on the way so it does not need to be read back.
+        ckpt_hash = await asyncio.to_thread(
+            self._download_file,
+            hf_hub_url(repo_id, "checkpoint.safetensors", revision=model_id.commit),
+            ckpt_path,
+            token,
+        )
 
         # Compute the hash of the downloaded model.
-        model_hash = utils.get_hash_of_directory(model_dir)
+        model_hash = await asyncio.to_thread(
+            utils.get_hash_of_directory, model_dir, file_hashes={ckpt_path: ckpt_hash}
+        )
         model_id_with_hash = ModelId(
             namespace=model_id.namespace,
             name=model_id.name,
@@ -1,5 +1,5 @@
 import abc
-from typing import Dict
+from typing import Dict, Optional
 from model.data import Model, ModelId
 from constants import CompetitionParameters
 
@@ -22,6 +22,11 @@ class LocalModelStore(abc.ABC):
         """Retrieves a trained model from the appropriate location based on implementation."""
         pass
 
+    @abc.abstractmethod
+    def try_load(self, hotkey: str, model_id: ModelId) -> Optional[Model]:
+        """Returns the model if it is already stored locally, with the hash computed from its content."""
+        pass
+
     @abc.abstractmethod
     def delete_unreferenced_models(
         self, valid_models_by_hotkey: Dict[str, ModelId], grace_period_seconds: int
@@ -1,5 +1,5 @@
 import abc
-from typing import Optional
+from typing import Dict, Iterable, Optional
 from model.data import ModelId, ModelMetadata
 
 
@@ -15,3 +15,14 @@ class ModelMetadataStore(abc.ABC):
     async def retrieve_model_metadata(self, hotkey: str) -> Optional[ModelMetadata]:
         """Retrieves model metadata + block information on this subnet for specific miner, if present"""
         pass
+
+    async def batch_get_metadata(
+        self, hotkeys: Iterable[str]
+    ) -> Dict[str, Optional[ModelMetadata]]:
+        """Retrieves model metadata for many miners at once, keyed by hotkey.
+
+        Implementations should override this with a single round trip where possible.
+        """
+        return {
+            hotkey: await self.retrieve_model_metadata(hotkey) for hotkey in hotkeys
+        }
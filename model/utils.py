@@ -1,9 +1,14 @@
 import base64
+import functools
 import hashlib
 
 
+@functools.lru_cache(maxsize=4096)
 def get_hash_of_two_strings(string1: str, string2: str) -> str:
-    """Hashes two strings together and returns the result."""
+    """Hashes two strings together and returns the result.
+
+    Results are cached since validators repeatedly check the same (model hash, hotkey) pairs.
+    """
 
     string_hash = hashlib.sha256((string1 + string2).encode())
 
@@ -308,7 +308,7 @@ class Validator:
             bt.logging.info("Syncing models for the first 32 hotkeys. This may take a while...")
             uids_to_sync = list(uids_to_eval)[:32]
             hotkeys = [self.metagraph.hotkeys[uid] for uid in uids_to_sync]
-            results = asyncio.run(self.model_updater.sync_models(hotkeys))
+            results = asyncio.run(self.model_updater.sync_models_all(hotkeys))
             bt.logging.info("Syncing models for the first 32 hotkeys. This may take a while... Done!")
 
             for uid in uids_to_sync:
@@ -352,6 +352,9 @@ class Validator:
         )
         self.clean_thread.start()
 
+        # == Initialize the prefetcher to download models ahead of evaluation ==
+        self.model_updater.start_prefetcher()
+
     @property
     def sample_stats_corrected(self):
         count = self.count_per_uid
@@ -366,6 +369,7 @@ class Validator:
             self.stop_event.set()
             self.update_thread.join()
             self.clean_thread.join()
+            self.model_updater.stop_prefetcher()
 
     def new_wandb_run(self):
         """Creates a new wandb run to save information to."""
@@ -620,21 +624,28 @@ class Validator:
             int, typing.Tuple[str, typing.Optional[ModelMetadata]]
         ] = {}
         uid_to_seed = {uid: seed for uid, seed in zip(uids, self.seeds_to_eval)}
+
+        if self.uids_queue.epochs == 0:
+            # On the first step, don't ignore models that have not been synced unless we have tried to sync and failed.
+            hotkeys_to_sync = [
+                self.metagraph.hotkeys[uid_i]
+                for uid_i in uids
+                if uid_i not in self.uid_last_checked
+            ]
+            while hotkeys_to_sync:
+                # Retry if we get a timeout while querying the chain for model metadata.
+                try:
+                    asyncio.run(
+                        self.model_updater.sync_models_metadata_only(hotkeys_to_sync)
+                    )
+                    break
+                except TimeoutError as e:
+                    pass
+
         for uid_i in uids:
             # Check that the model is in the tracker.
             hotkey = self.metagraph.hotkeys[uid_i]
 
-            if self.uids_queue.epochs == 0 and uid_i not in self.uid_last_checked:
-                # On the first step, don't ignore models that have not been synced unless we have tried to sync and failed.
-                hotkey = self.metagraph.hotkeys[uid_i]
-                while True:
-                    # Retry if we get a timeout while querying the chain for model metadata.
-                    try:
-                        asyncio.run(self.model_updater.sync_model_metadata_only(hotkey))
-                        break
-                    except TimeoutError as e:
-                        pass
-
             model_i_metadata = self.model_tracker.take_model_metadata_for_miner_hotkey(
                 hotkey
             )
@@ -838,6 +849,17 @@ class Validator:
         bt.logging.debug(f"Uids to eval: {uids_to_eval}")
         self.uids_to_eval[competition_parameters.competition_id] = uids_to_eval
 
+        # Download the models for the next step in the background while this one is logged and weights are set.
+        next_competition_parameters = constants.COMPETITION_SCHEDULE[
+            (self.global_step + 1) % len(constants.COMPETITION_SCHEDULE)
+        ]
+        self.model_updater.prefetch(
+            self.metagraph.hotkeys[uid]
+            for uid in self.uids_to_eval.get(
+                next_competition_parameters.competition_id, []
+            )
+        )
+
         # Log the performance of the eval loop.
         bt.logging.debug(load_model_perf.summary_str())
         bt.logging.debug(compute_loss_perf.summary_str())
@@ -0,0 +1,115 @@
+import asyncio
+from types import SimpleNamespace
+
+from model.data import ModelId
+from model.storage.chain import chain_model_metadata_store
+from model.storage.chain.chain_model_metadata_store import ChainModelMetadataStore
+
+
+class FakeStorageKey:
+    def __init__(self, hotkey: str):
+        self.hotkey = hotkey
+
+    def to_hex(self) -> str:
+        return "0x" + self.hotkey.encode().hex()
+
+
+class FakeSubstrate:
+    def __init__(self, commitments: dict):
+        self.commitments = commitments
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def create_storage_key(self, pallet: str, storage_function: str, params: list):
+        return FakeStorageKey(params[1])
+
+    def query_multi(self, storage_keys: list):
+        # Return the results in a different order than requested, like the chain may.
+        return [
+            # Use new key objects so results can only be matched back by their hex value.
+            (
+                FakeStorageKey(key.hotkey),
+                SimpleNamespace(value=self.commitments.get(key.hotkey)),
+            )
+            for key in reversed(storage_keys)
+        ]
+
+
+def make_commitment(model_id: ModelId, block: int) -> dict:
+    hex_data = "0x" + model_id.to_compressed_str().encode().hex()
+    return {"info": {"fields": [{"Raw64": hex_data}]}, "block": block}
+
+
+def make_store(commitments: dict, monkeypatch) -> ChainModelMetadataStore:
+    # Run the chain query inline instead of in a subprocess.
+    monkeypatch.setattr(
+        chain_model_metadata_store.utils,
+        "run_in_subprocess",
+        lambda func, ttl: func(),
+    )
+    subtensor = SimpleNamespace(substrate=FakeSubstrate(commitments))
+    return ChainModelMetadataStore(subtensor=subtensor, subnet_uid=1)
+
+
+def make_model_id(name: str) -> ModelId:
+    return ModelId(
+        namespace="namespace",
+        name=name,
+        commit="commit",
+        hash="hash",
+        competition_id="p240",
+    )
+
+
+def test_batch_get_metadata_maps_results_to_hotkeys(monkeypatch):
+    commitments = {
+        "hk1": make_commitment(make_model_id("model1"), 1),
+        "hk2": make_commitment(make_model_id("model2"), 2),
+        "hk3": make_commitment(make_model_id("model3"), 3),
+    }
+    store = make_store(commitments, monkeypatch)
+
+    metadata = asyncio.run(store.batch_get_metadata(["hk1", "hk2", "hk3"]))
+
+    assert metadata["hk1"].id == make_model_id("model1")
+    assert metadata["hk1"].block == 1
+    assert metadata["hk2"].id == make_model_id("model2")
+    assert metadata["hk2"].block == 2
+    assert metadata["hk3"].id == make_model_id("model3")
+    assert metadata["hk3"].block == 3
+
+
+def test_batch_get_metadata_returns_none_for_missing_commitment(monkeypatch):
+    store = make_store(
+        {"hk1": make_commitment(make_model_id("model1"), 1)}, monkeypatch
+    )
+
+    metadata = asyncio.run(store.batch_get_metadata(["hk1", "missing"]))
+
+    assert metadata["hk1"].id == make_model_id("model1")
+    assert metadata["missing"] is None
+
+
+def test_batch_get_metadata_isolates_malformed_commitment(monkeypatch):
+    commitments = {
+        "hk1": make_commitment(make_model_id("model1"), 1),
+        "malformed": {"info": {"fields": []}, "block": 2},
+        "hk3": make_commitment(make_model_id("model3"), 3),
+    }
+    store = make_store(commitments, monkeypatch)
+
+    metadata = asyncio.run(store.batch_get_metadata(["hk1", "malformed", "hk3"]))
+
+    assert metadata["hk1"].id == make_model_id("model1")
+    assert metadata["malformed"] is None
+    assert metadata["hk3"].id == make_model_id("model3")
+
+
+def test_batch_get_metadata_with_no_hotkeys(monkeypatch):
+    store = make_store({}, monkeypatch)
+
+    assert asyncio.run(store.batch_get_metadata([])) == {}
@@ -0,0 +1,63 @@
+import os
+import time
+
+from model.data import ModelId
+from model.storage.disk import utils
+from model.storage.disk.disk_model_store import DiskModelStore
+
+
+def make_model_id(hash: str = "chain_hash") -> ModelId:
+    return ModelId(
+        namespace="namespace",
+        name="name",
+        commit="commit",
+        hash=hash,
+        competition_id="p240",
+    )
+
+
+def test_try_load_returns_model_with_content_hash(tmp_path):
+    store = DiskModelStore(base_dir=str(tmp_path))
+    model_id = make_model_id()
+    model_dir = utils.get_local_model_snapshot_dir(str(tmp_path), "hotkey", model_id)
+    os.makedirs(model_dir)
+    with open(os.path.join(model_dir, "checkpoint.safetensors"), "wb") as f:
+        f.write(b"checkpoint")
+
+    model = store.try_load("hotkey", model_id)
+
+    assert model is not None
+    assert model.ckpt == model_dir
+    assert model.id.commit == model_id.commit
+    assert model.id.hash == utils.get_hash_of_directory(model_dir)
+
+
+def test_try_load_returns_none_when_not_on_disk(tmp_path):
+    store = DiskModelStore(base_dir=str(tmp_path))
+
+    assert store.try_load("hotkey", make_model_id()) is None
+
+
+def test_delete_unreferenced_models_removes_stale_incomplete_downloads(tmp_path):
+    store = DiskModelStore(base_dir=str(tmp_path))
+    model_id = make_model_id()
+    model_dir = utils.get_local_model_snapshot_dir(str(tmp_path), "hotkey", model_id)
+    os.makedirs(model_dir)
+    snapshots_dir = os.path.dirname(model_dir)
+    stale_path = os.path.join(snapshots_dir, "stale.incomplete")
+    fresh_path = os.path.join(snapshots_dir, "fresh.incomplete")
+    for path in (stale_path, fresh_path):
+        with open(path, "wb") as f:
+            f.write(b"partial")
+    # Make the stale download look like it stopped an hour ago.
+    os.utime(stale_path, (time.time() - 3600, time.time() - 3600))
+
+    store.delete_unreferenced_models(
+        valid_models_by_hotkey={"hotkey": model_id},
+        model_touched_by_hotkey={},
+        grace_period_seconds=60,
+    )
+
+    assert not os.path.exists(stale_path)
+    assert os.path.exists(fresh_path)
+    assert os.path.exists(model_dir)
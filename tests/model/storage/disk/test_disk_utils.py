@@ -0,0 +1,23 @@
+import base64
+import hashlib
+import os
+
+from model.storage.disk import utils
+
+
+def test_get_hash_of_directory_with_known_file_hashes(tmp_path):
+    os.makedirs(tmp_path / "nested")
+    (tmp_path / "checkpoint.safetensors").write_bytes(b"checkpoint")
+    (tmp_path / "nested" / "config.json").write_bytes(b"{}")
+
+    ckpt_path = os.path.join(str(tmp_path), "checkpoint.safetensors")
+    # Matches how the checkpoint hash is computed while streaming a download.
+    streamed_hash = base64.b64encode(hashlib.sha256(b"checkpoint").digest()).decode(
+        "utf-8"
+    )
+    assert streamed_hash == utils.get_hash_of_file(ckpt_path)
+    file_hashes = {ckpt_path: streamed_hash}
+
+    assert utils.get_hash_of_directory(
+        str(tmp_path), file_hashes=file_hashes
+    ) == utils.get_hash_of_directory(str(tmp_path))
@@ -0,0 +1,85 @@
+import os
+
+import pytest
+
+from model.storage.disk import utils
+from model.storage.hugging_face import hugging_face_model_store
+from model.storage.hugging_face.hugging_face_model_store import HuggingFaceModelStore
+
+
+class FakeResponse:
+    def __init__(self, chunks, error=None):
+        self.chunks = chunks
+        self.error = error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size):
+        for chunk in self.chunks:
+            yield chunk
+        if self.error:
+            raise self.error
+
+
+class FakeSession:
+    def __init__(self, response: FakeResponse):
+        self.response = response
+
+    def get(self, url, headers, stream, timeout):
+        return self.response
+
+
+def use_response(monkeypatch, response: FakeResponse):
+    monkeypatch.setattr(
+        hugging_face_model_store, "get_session", lambda: FakeSession(response)
+    )
+
+
+def get_paths(tmp_path):
+    snapshots_dir = tmp_path / "snapshots"
+    ckpt_path = snapshots_dir / "commit" / "checkpoint.safetensors"
+    return snapshots_dir, ckpt_path
+
+
+def test_download_file_returns_hash_of_content(tmp_path, monkeypatch):
+    use_response(monkeypatch, FakeResponse([b"check", b"point"]))
+    snapshots_dir, ckpt_path = get_paths(tmp_path)
+
+    file_hash = HuggingFaceModelStore()._download_file("url", str(ckpt_path), None)
+
+    assert ckpt_path.read_bytes() == b"checkpoint"
+    assert file_hash == utils.get_hash_of_file(str(ckpt_path))
+    assert list(snapshots_dir.glob("*.incomplete")) == []
+
+
+def test_download_file_aborts_over_size_limit(tmp_path, monkeypatch):
+    monkeypatch.setattr(hugging_face_model_store, "MAX_HUGGING_FACE_BYTES", 8)
+    use_response(monkeypatch, FakeResponse([b"check", b"point"]))
+    snapshots_dir, ckpt_path = get_paths(tmp_path)
+
+    with pytest.raises(ValueError):
+        HuggingFaceModelStore()._download_file("url", str(ckpt_path), None)
+
+    assert list(snapshots_dir.glob("*.incomplete")) == []
+    assert not os.path.exists(ckpt_path.parent)
+
+
+def test_download_file_keeps_existing_file_on_error(tmp_path, monkeypatch):
+    use_response(monkeypatch, FakeResponse([b"new"], error=ConnectionError()))
+    snapshots_dir, ckpt_path = get_paths(tmp_path)
+    ckpt_path.parent.mkdir(parents=True)
+    ckpt_path.write_bytes(b"old")
+
+    with pytest.raises(ConnectionError):
+        HuggingFaceModelStore()._download_file("url", str(ckpt_path), None)
+
+    # The file is only replaced once the download completes.
+    assert ckpt_path.read_bytes() == b"old"
+    assert list(snapshots_dir.glob("*.incomplete")) == []
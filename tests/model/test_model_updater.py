@@ -0,0 +1,304 @@
+import asyncio
+from typing import Dict, List, Optional
+
+import pytest
+
+from constants import CompetitionParameters
+from model.data import Model, ModelId, ModelMetadata
+from model.model_tracker import ModelTracker
+from model.model_updater import ModelUpdater
+from model.storage.local_model_store import LocalModelStore
+from model.storage.model_metadata_store import ModelMetadataStore
+from model.storage.remote_model_store import RemoteModelStore
+from model.utils import get_hash_of_two_strings
+
+
+def make_metadata(hash: str, block: int = 1) -> ModelMetadata:
+    return ModelMetadata(
+        id=ModelId(
+            namespace="namespace",
+            name="name",
+            commit="commit",
+            hash=hash,
+            competition_id="p240",
+        ),
+        block=block,
+    )
+
+
+class FakeMetadataStore(ModelMetadataStore):
+    def __init__(self, metadata_by_hotkey: Dict[str, ModelMetadata]):
+        self.metadata_by_hotkey = metadata_by_hotkey
+        self.batch_error: Optional[Exception] = None
+
+    async def store_model_metadata(self, hotkey: str, model_id: ModelId):
+        pass
+
+    async def retrieve_model_metadata(self, hotkey: str) -> Optional[ModelMetadata]:
+        return self.metadata_by_hotkey.get(hotkey)
+
+    async def batch_get_metadata(self, hotkeys):
+        if self.batch_error:
+            raise self.batch_error
+        return await super().batch_get_metadata(hotkeys)
+
+
+class FakeRemoteStore(RemoteModelStore):
+    def __init__(self):
+        self.downloaded: List[ModelId] = []
+        self.active = 0
+        self.max_active = 0
+        # Called while the download is in progress, after yielding to the event loop.
+        self.on_download = None
+
+    async def upload_model(
+        self, model: Model, parameters: CompetitionParameters
+    ) -> ModelId:
+        return model.id
+
+    async def download_model(
+        self, model_id: ModelId, local_path: str, parameters: CompetitionParameters
+    ) -> Model:
+        self.downloaded.append(model_id)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(0.01)
+            if self.on_download:
+                self.on_download(model_id)
+        finally:
+            self.active -= 1
+        return Model(id=model_id, ckpt=local_path)
+
+
+class FakeLocalStore(LocalModelStore):
+    def __init__(self):
+        self.models: Dict[str, Model] = {}
+
+    def store_model(self, hotkey: str, model: Model) -> ModelId:
+        return model.id
+
+    def get_path(self, hotkey: str) -> str:
+        return f"/tmp/{hotkey}"
+
+    def retrieve_model(
+        self, hotkey: str, model_id: ModelId, parameters: CompetitionParameters
+    ) -> Model:
+        return Model(id=model_id, ckpt=self.get_path(hotkey))
+
+    def try_load(self, hotkey: str, model_id: ModelId) -> Optional[Model]:
+        return self.models.get(hotkey)
+
+    def delete_unreferenced_models(self, valid_models_by_hotkey, grace_period_seconds):
+        pass
+
+
+def make_updater(
+    metadata_by_hotkey: Optional[Dict[str, ModelMetadata]] = None,
+    max_concurrent_downloads: int = 4,
+):
+    tracker = ModelTracker()
+    remote_store = FakeRemoteStore()
+    local_store = FakeLocalStore()
+    updater = ModelUpdater(
+        metadata_store=FakeMetadataStore(metadata_by_hotkey or {}),
+        remote_store=remote_store,
+        local_store=local_store,
+        model_tracker=tracker,
+        max_concurrent_downloads=max_concurrent_downloads,
+    )
+    return updater, tracker, remote_store, local_store
+
+
+def test_sync_models_all_maps_batch_failure_to_every_hotkey():
+    updater, _, _, _ = make_updater()
+    error = TimeoutError("chain timed out")
+    updater.metadata_store.batch_error = error
+
+    results = asyncio.run(updater.sync_models_all(["hk1", "hk2"]))
+
+    assert results == [error, error]
+
+
+def test_sync_models_all_returns_results_in_hotkey_order():
+    updater, tracker, remote_store, _ = make_updater(
+        {"hk1": make_metadata("hash1"), "hk2": make_metadata("hash2")}
+    )
+
+    results = asyncio.run(updater.sync_models_all(["hk1", "missing", "hk2"]))
+
+    assert results == [True, False, True]
+    assert len(remote_store.downloaded) == 2
+    assert tracker.model_downloaded == {"hk1", "hk2"}
+
+
+def test_sync_models_all_limits_concurrent_downloads():
+    hotkeys = [f"hk{i}" for i in range(5)]
+    updater, tracker, remote_store, _ = make_updater(
+        {hotkey: make_metadata(hotkey) for hotkey in hotkeys},
+        max_concurrent_downloads=2,
+    )
+
+    results = asyncio.run(updater.sync_models_all(hotkeys))
+
+    assert results == [True] * len(hotkeys)
+    assert remote_store.max_active == 2
+    assert tracker.model_downloaded == set(hotkeys)
+
+
+def test_download_semaphore_is_per_event_loop():
+    updater, _, _, _ = make_updater()
+
+    async def get_semaphores():
+        return updater._get_download_semaphore(), updater._get_download_semaphore()
+
+    first, same = asyncio.run(get_semaphores())
+    other, _ = asyncio.run(get_semaphores())
+
+    assert first is same
+    assert first is not other
+
+
+def test_ensure_model_downloaded_reuses_matching_local_model():
+    updater, tracker, remote_store, local_store = make_updater()
+    metadata = make_metadata("hash")
+    tracker.on_miner_model_updated_metadata_only("hk", metadata)
+    local_store.models["hk"] = Model(id=metadata.id, ckpt="/tmp/hk")
+
+    asyncio.run(updater.ensure_model_downloaded("hk"))
+
+    assert remote_store.downloaded == []
+    assert "hk" in tracker.model_downloaded
+
+
+def test_ensure_model_downloaded_reuses_local_model_with_hotkey_hash():
+    updater, tracker, remote_store, local_store = make_updater()
+    metadata = make_metadata(get_hash_of_two_strings("content_hash", "hk"))
+    tracker.on_miner_model_updated_metadata_only("hk", metadata)
+    local_store.models["hk"] = Model(
+        id=metadata.id.copy(update={"hash": "content_hash"}), ckpt="/tmp/hk"
+    )
+
+    asyncio.run(updater.ensure_model_downloaded("hk"))
+
+    assert remote_store.downloaded == []
+    assert "hk" in tracker.model_downloaded
+
+
+def test_ensure_model_downloaded_downloads_when_local_model_does_not_match():
+    updater, tracker, remote_store, local_store = make_updater()
+    metadata = make_metadata("hash")
+    tracker.on_miner_model_updated_metadata_only("hk", metadata)
+    local_store.models["hk"] = Model(
+        id=metadata.id.copy(update={"hash": "stale_hash"}), ckpt="/tmp/hk"
+    )
+
+    asyncio.run(updater.ensure_model_downloaded("hk"))
+
+    assert remote_store.downloaded == [metadata.id]
+    assert "hk" in tracker.model_downloaded
+
+
+def test_concurrent_ensure_model_downloaded_downloads_once():
+    updater, tracker, remote_store, _ = make_updater()
+    tracker.on_miner_model_updated_metadata_only("hk", make_metadata("hash"))
+
+    async def run():
+        await asyncio.gather(
+            updater.ensure_model_downloaded("hk"),
+            updater.ensure_model_downloaded("hk"),
+        )
+
+    asyncio.run(run())
+
+    assert len(remote_store.downloaded) == 1
+    assert "hk" in tracker.model_downloaded
+    assert tracker.download_inflight == {}
+
+
+def test_ensure_model_downloaded_does_not_leak_claim_for_untracked_hotkey():
+    updater, tracker, _, _ = make_updater()
+
+    with pytest.raises(KeyError):
+        asyncio.run(updater.ensure_model_downloaded("hk"))
+
+    assert tracker.download_inflight == {}
+
+
+def test_sync_model_and_ensure_model_downloaded_do_not_overlap():
+    updater, tracker, remote_store, _ = make_updater({"hk": make_metadata("new_hash", 2)})
+    tracker.on_miner_model_updated_metadata_only("hk", make_metadata("old_hash", 1))
+
+    async def run():
+        await asyncio.gather(
+            updater.ensure_model_downloaded("hk"), updater.sync_model("hk")
+        )
+
+    asyncio.run(run())
+
+    assert remote_store.max_active == 1
+    assert tracker.get_model_metadata_for_miner_hotkey("hk").id.hash == "new_hash"
+    assert "hk" in tracker.model_downloaded
+    assert tracker.download_inflight == {}
+
+
+def test_ensure_model_downloaded_retries_when_metadata_changes_mid_download():
+    updater, tracker, remote_store, _ = make_updater()
+    old_metadata = make_metadata("old_hash", 1)
+    new_metadata = make_metadata("new_hash", 2)
+    tracker.on_miner_model_updated_metadata_only("hk", old_metadata)
+
+    def on_download(model_id: ModelId):
+        if model_id.hash == old_metadata.id.hash:
+            # The chain metadata changes while the old model is still downloading.
+            tracker.on_miner_model_updated_metadata_only("hk", new_metadata)
+        else:
+            # The stale download must not have been marked as downloaded.
+            assert "hk" not in tracker.model_downloaded
+
+    remote_store.on_download = on_download
+
+    asyncio.run(updater.ensure_model_downloaded("hk"))
+
+    assert remote_store.downloaded == [old_metadata.id, new_metadata.id]
+    assert "hk" in tracker.model_downloaded
+    assert tracker.download_inflight == {}
+
+
+def test_prefetch_downloads_new_and_metadata_only_models():
+    updater, tracker, remote_store, _ = make_updater(
+        {"new": make_metadata("new_hash", 2), "tracked": make_metadata("tracked_hash")}
+    )
+    tracker.on_miner_model_updated_metadata_only("tracked", make_metadata("tracked_hash"))
+
+    updater.start_prefetcher()
+    try:
+        updater.prefetch(["new", "tracked", "missing"]).result(timeout=5)
+    finally:
+        updater.stop_prefetcher()
+
+    assert len(remote_store.downloaded) == 2
+    assert tracker.model_downloaded == {"new", "tracked"}
+    assert tracker.get_model_metadata_for_miner_hotkey("new").id.hash == "new_hash"
+    assert tracker.download_inflight == {}
+
+
+def test_prefetch_does_not_update_tracker_when_download_fails():
+    updater, tracker, remote_store, _ = make_updater({"hk": make_metadata("new_hash", 2)})
+    old_metadata = make_metadata("old_hash", 1)
+    tracker.on_miner_model_updated("hk", old_metadata)
+
+    def on_download(model_id: ModelId):
+        raise ConnectionError()
+
+    remote_store.on_download = on_download
+
+    updater.start_prefetcher()
+    try:
+        updater.prefetch(["hk"]).result(timeout=5)
+    finally:
+        updater.stop_prefetcher()
+
+    assert remote_store.downloaded == [make_metadata("new_hash", 2).id]
+    assert tracker.get_model_metadata_for_miner_hotkey("hk") == old_metadata
+    assert "hk" in tracker.model_downloaded
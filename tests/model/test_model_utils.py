@@ -8,3 +8,13 @@ def test_get_hash_of_two_strings():
     result = get_hash_of_two_strings(string1, string2)
 
     assert result == "k2oYXKqiZrucvpgengXLeM1zKwsygOuURBK7b4+PB68="
+
+
+def test_get_hash_of_two_strings_is_cached():
+    get_hash_of_two_strings.cache_clear()
+
+    first = get_hash_of_two_strings("hello", "world")
+    second = get_hash_of_two_strings("hello", "world")
+
+    assert first == second
+    assert get_hash_of_two_strings.cache_info().hits == 1
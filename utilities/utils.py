@@ -24,6 +24,12 @@ def assert_registered(wallet: bt.wallet, metagraph: bt.metagraph) -> int:
     return uid
 
 
+def is_trace_enabled() -> bool:
+    """Returns whether trace logging is on so callers can skip building trace messages that would be dropped."""
+    # Default to on if this version of bittensor does not expose the flag.
+    return getattr(bt.logging, "__trace_on__", True)
+
+
 def validate_hf_repo_id(repo_id: str) -> Tuple[str, str]:
     """Verifies a Hugging Face repo id is valid and returns it split into namespace and name.
 